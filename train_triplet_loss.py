@@ -1,12 +1,12 @@
 import numpy as np
 import argparse
 import os
-import gc
+import threading
 import torch
 import torch.nn as nn
 import torch.optim as optim
 import torchvision.transforms as transforms
-from torch.nn.modules.distance import PairwiseDistance
+from torch.nn import functional as F
 from datasets.LFWDataset import LFWDataset
 from losses.triplet_loss import TripletLoss
 from datasets.TripletLossDataset import TripletFaceDataset
@@ -64,8 +64,8 @@ parser.add_argument('--num_generate_triplets_processes', default=0, type=int,
 parser.add_argument('--resume_path', default='',  type=str,
                     help='path to latest model checkpoint: (model_training_checkpoints/model_resnet18_epoch_1.pt file) (default: None)'
                     )
-parser.add_argument('--num_workers', default=2, type=int,
-                    help="Number of workers for data loaders (default: 2)"
+parser.add_argument('--num_workers', default=max(8, os.cpu_count() // 2), type=int,
+                    help="Number of workers for data loaders (default: half the available CPU cores, at least 8)"
                     )
 parser.add_argument('--optimizer', type=str, default="adagrad", choices=["sgd", "adagrad", "rmsprop", "adam"],
                     help="Required optimizer for training the model: ('sgd','adagrad','rmsprop','adam'), (default: 'adagrad')"
@@ -79,6 +79,9 @@ parser.add_argument('--margin', default=0.2, type=float,
 parser.add_argument('--image_size', default=224, type=int,
                     help='Input image size (default: 224 (224x224), must be 299x299 for Inception-ResNet-V2)'
                     )
+parser.add_argument('--sync_bn', default=False, type=bool,
+                    help="If True: convert BatchNorm layers to SyncBatchNorm for multi-gpu (DistributedDataParallel) training. Adds one NCCL all-reduce per BatchNorm layer per forward pass, so only enable it if per-gpu batches are too small for stable statistics. (Default: False)"
+                    )
 parser.add_argument('--use_semihard_negatives', default=True, type=bool,
                     help="If True: use semihard negative triplet selection. Else: use hard negative triplet selection (Default: True)"
                     )
@@ -87,6 +90,12 @@ parser.add_argument('--training_triplets_path', default=None, type=str,
                     )
 args = parser.parse_args()
 
+# Let cudnn benchmark convolution algorithms for the fixed input shapes used during training
+torch.backends.cudnn.benchmark = True
+
+# Gradient scaler for mixed-precision training (scales the loss to avoid float16 gradient underflow)
+scaler = torch.cuda.amp.GradScaler()
+
 
 def set_model_architecture(model_architecture, pretrained, embedding_dimension):
     if model_architecture == "resnet18":
@@ -129,17 +138,44 @@ def set_model_architecture(model_architecture, pretrained, embedding_dimension):
     return model
 
 
-def set_model_gpu_mode(model):
+def set_model_gpu_mode(model, sync_bn=False):
     flag_train_gpu = torch.cuda.is_available()
     flag_train_multi_gpu = False
 
-    if flag_train_gpu and torch.cuda.device_count() > 1:
-        model = nn.DataParallel(model)
+    # Store the conv weights in channels_last (NHWC) memory format for faster cudnn convolutions.
+    #  This must happen before the DistributedDataParallel wrap below so the Reducer builds its
+    #  gradient buckets with NHWC strides; converting afterwards would make every backward pass fall
+    #  back to copying each bucket because the gradient strides no longer match the bucket views
+    model = model.to(memory_format=torch.channels_last)
+
+    # Multi-gpu training uses DistributedDataParallel with one process per GPU (launched with
+    #  'torchrun --nproc_per_node=N train_triplet_loss.py ...') so gradient all-reduce runs over NCCL
+    #  and overlaps with the backward pass instead of being serialized on one process like DataParallel
+    if flag_train_gpu and int(os.environ.get("WORLD_SIZE", 1)) > 1:
+        torch.distributed.init_process_group(backend="nccl")
+        local_rank = int(os.environ["LOCAL_RANK"])
+        torch.cuda.set_device(local_rank)
+
+        # Synchronizing BatchNorm statistics across ranks costs one NCCL all-reduce per BatchNorm
+        #  layer per forward pass, so it stays opt-in: the large effective global batch of the
+        #  triplet trainer usually keeps the per-gpu statistics stable without it
+        if sync_bn:
+            model = nn.SyncBatchNorm.convert_sync_batchnorm(model)
+
         model.cuda()
+        # broadcast_buffers stays off so forward passes post no collectives: the LFW validation
+        #  forward runs on rank 0 only, and a default buffer broadcast there would wait forever for
+        #  the other ranks (which are already at the next epoch's triplet-generation barrier). Each
+        #  rank keeps its own BatchNorm running stats; use --sync_bn for cross-rank statistics.
+        model = nn.parallel.DistributedDataParallel(
+            model,
+            device_ids=[local_rank],
+            broadcast_buffers=False
+        )
         flag_train_multi_gpu = True
-        print('Using multi-gpu training.')
+        print('Using multi-gpu (DistributedDataParallel) training.')
 
-    elif flag_train_gpu and torch.cuda.device_count() == 1:
+    elif flag_train_gpu:
         model.cuda()
         print('Using single-gpu training.')
 
@@ -187,27 +223,43 @@ def set_optimizer(optimizer, model, learning_rate):
     return optimizer_model
 
 
-def validate_lfw(model, lfw_dataloader, model_architecture, epoch, epochs):
+def validate_lfw(model, lfw_dataloader, model_architecture, epoch, epochs, lfw_cache, lfw_log_file):
     model.eval()
     with torch.no_grad():
-        l2_distance = PairwiseDistance(p=2)
         distances, labels = [], []
 
         print("Validating on LFW! ...")
-        progress_bar = enumerate(tqdm(lfw_dataloader))
+
+        # The transformed LFW batches are cached on the first validation round, later rounds iterate
+        #  the cached pinned-memory tensors and skip the image decode and transform pipeline entirely
+        populate_cache = not lfw_cache
+        if populate_cache:
+            progress_bar = enumerate(tqdm(lfw_dataloader))
+        else:
+            progress_bar = enumerate(tqdm(lfw_cache))
 
         for batch_index, (data_a, data_b, label) in progress_bar:
-            data_a = data_a.cuda()
-            data_b = data_b.cuda()
+            if populate_cache:
+                # Batches produced by the pin_memory dataloader are already page-locked, so holding
+                #  the references is enough to reuse them with non-blocking uploads on later rounds
+                lfw_cache.append((data_a, data_b, label))
+
+            data_a = data_a.cuda(non_blocking=True)
+            data_b = data_b.cuda(non_blocking=True)
+
+            # Reduced-precision inference: validation computes no gradients, so halving the
+            #  activation bandwidth with float16 is free accuracy-wise at LFW embedding scale
+            with torch.cuda.amp.autocast(dtype=torch.float16):
+                output_a, output_b = model(data_a), model(data_b)
 
-            output_a, output_b = model(data_a), model(data_b)
-            distance = l2_distance.forward(output_a, output_b)  # Euclidean distance
+            distance = F.pairwise_distance(output_a.float(), output_b.float(), p=2)  # Euclidean distance
 
-            distances.append(distance.cpu().detach().numpy())
-            labels.append(label.cpu().detach().numpy())
+            distances.append(distance.detach())  # Kept on the GPU until after the loop
+            labels.append(label)
 
-        labels = np.array([sublabel for label in labels for sublabel in label])
-        distances = np.array([subdist for distance in distances for subdist in distance])
+        # Concatenate on device and move to host once instead of one small sync per batch
+        labels = torch.cat(labels).cpu().numpy()
+        distances = torch.cat(distances).cpu().numpy()
 
         true_positive_rate, false_positive_rate, precision, recall, accuracy, roc_auc, best_distances, \
         tar, far = evaluate_lfw(
@@ -233,22 +285,21 @@ def validate_lfw(model, lfw_dataloader, model_architecture, epoch, epochs):
                     np.mean(far)
                 )
         )
-        with open('logs/lfw_{}_log_triplet.txt'.format(model_architecture), 'a') as f:
-            val_list = [
-                epoch,
-                np.mean(accuracy),
-                np.std(accuracy),
-                np.mean(precision),
-                np.std(precision),
-                np.mean(recall),
-                np.std(recall),
-                roc_auc,
-                np.mean(best_distances),
-                np.std(best_distances),
-                np.mean(tar)
-            ]
-            log = '\t'.join(str(value) for value in val_list)
-            f.writelines(log + '\n')
+        val_list = [
+            epoch,
+            np.mean(accuracy),
+            np.std(accuracy),
+            np.mean(precision),
+            np.std(precision),
+            np.mean(recall),
+            np.std(recall),
+            roc_auc,
+            np.mean(best_distances),
+            np.std(best_distances),
+            np.mean(tar)
+        ]
+        log = '\t'.join(str(value) for value in val_list)
+        lfw_log_file.write(log + '\n')
 
     try:
         # Plot ROC curve
@@ -270,21 +321,36 @@ def validate_lfw(model, lfw_dataloader, model_architecture, epoch, epochs):
 
 
 def forward_pass(imgs, model, batch_size):
-    imgs = imgs.cuda()
-    embeddings = model(imgs)
+    # imgs already lives in the preallocated channels_last CUDA batch buffer
+
+    # Mixed-precision forward pass: halves activation bandwidth and enables Tensor Core GEMMs on
+    #  supported GPUs, the loss is still reduced in float32 before the scaled backward pass
+    with torch.cuda.amp.autocast(dtype=torch.float16):
+        embeddings = model(imgs)
 
-    # Split the embeddings into Anchor, Positive, and Negative embeddings
-    anc_embeddings = embeddings[:batch_size]
-    pos_embeddings = embeddings[batch_size: batch_size * 2]
-    neg_embeddings = embeddings[batch_size * 2:]
+    # Split the embeddings into Anchor, Positive, and Negative embeddings: a single reshape with
+    #  three views sharing one backward node instead of three separate autograd slice subgraphs
+    anc_embeddings, pos_embeddings, neg_embeddings = embeddings.view(3, batch_size, -1).unbind(0)
 
-    # Free some memory
+    # Free some memory (del drops the refs to the CUDA storage eagerly via refcounting, running
+    #  gc.collect() here would walk the whole Python object graph every iteration for no benefit)
     del imgs, embeddings
-    gc.collect()
 
     return anc_embeddings, pos_embeddings, neg_embeddings, model
 
 
+def copy_state_to_cpu(state):
+    """Recursively clones all tensors in a checkpoint state dictionary to host memory."""
+    if torch.is_tensor(state):
+        return state.detach().cpu().clone()
+    elif isinstance(state, dict):
+        return {key: copy_state_to_cpu(value) for key, value in state.items()}
+    elif isinstance(state, list):
+        return [copy_state_to_cpu(value) for value in state]
+    else:
+        return state
+
+
 def main():
     dataroot = args.dataroot
     lfw_dataroot = args.lfw
@@ -345,6 +411,11 @@ def main():
         ),
         batch_size=lfw_batch_size,
         num_workers=num_workers,
+        # Worker persistence and prefetching only apply to multiprocessing loading; DataLoader
+        #  rejects both options when num_workers is 0
+        persistent_workers=num_workers > 0,  # Keep worker processes alive between validation rounds
+        prefetch_factor=4 if num_workers > 0 else None,
+        pin_memory=True,  # Pinned (page-locked) host memory allows asynchronous host to device copies
         shuffle=False
     )
 
@@ -355,8 +426,8 @@ def main():
         embedding_dimension=embedding_dimension
     )
 
-    # Load model to GPU or multiple GPUs if available
-    model, flag_train_multi_gpu = set_model_gpu_mode(model)
+    # Load model to GPU or multiple GPUs if available (also converts it to channels_last)
+    model, flag_train_multi_gpu = set_model_gpu_mode(model, sync_bn=args.sync_bn)
 
     # Set optimizer
     optimizer_model = set_optimizer(
@@ -373,6 +444,11 @@ def main():
             start_epoch = checkpoint['epoch'] + 1
             optimizer_model.load_state_dict(checkpoint['optimizer_model_state_dict'])
 
+            # Restore the gradient scaler so resuming does not reset the loss scale and skip the
+            #  first optimizer steps (checkpoints from before mixed-precision training lack the key)
+            if 'scaler_state_dict' in checkpoint:
+                scaler.load_state_dict(checkpoint['scaler_state_dict'])
+
             # In order to load state dict for optimizers correctly, model has to be loaded to gpu first
             if flag_train_multi_gpu:
                 model.module.load_state_dict(checkpoint['model_state_dict'])
@@ -382,6 +458,12 @@ def main():
         else:
             print("WARNING: No checkpoint found at {}!\nTraining from scratch.".format(resume_path))
 
+    # Compile the model with TorchInductor after the checkpoint resume: fuses the conv/BN/ReLU chains
+    #  of the backbones into generated kernels. The training batch shape (3 * batch_size) and the LFW
+    #  batch shape are fixed, so the model is compiled once per shape and replayed afterwards. The
+    #  same compiled module also serves the LFW validation forward passes.
+    model = torch.compile(model, mode="max-autotune", dynamic=False)
+
     if use_semihard_negatives:
         print("Using Semi-Hard negative triplet selection!")
     else:
@@ -389,32 +471,82 @@ def main():
 
     start_epoch = start_epoch
 
+    # Instantiate the loss object once instead of rebuilding it every training iteration
+    triplet_loss_fn = TripletLoss(margin=margin)
+
+    # Keep the epoch log files open for the whole run with line buffering instead of re-opening
+    #  them every epoch; every line is flushed on write so the accuracy plot still sees fresh data
+    train_log_file = open('logs/{}_log_triplet.txt'.format(model_architecture), 'a', buffering=1)
+    lfw_log_file = open('logs/lfw_{}_log_triplet.txt'.format(model_architecture), 'a', buffering=1)
+
+    # Background thread handle for the asynchronous end-of-epoch checkpoint writes
+    checkpoint_thread = None
+
+    # Cache for the transformed LFW validation batches, populated on the first validation round
+    lfw_cache = []
+
+    # Preallocated device-side buffer the anchor/positive/negative image batches are copied into,
+    #  reused across iterations instead of concatenating the three batches into a fresh host tensor
+    all_imgs_buf = torch.empty(
+        (3 * batch_size, 3, image_size, image_size), device='cuda'
+    ).to(memory_format=torch.channels_last)
+
     print("Training using triplet loss starting for {} epochs:\n".format(epochs - start_epoch))
 
     for epoch in range(start_epoch, epochs):
         num_valid_training_triplets = 0
-        l2_distance = PairwiseDistance(p=2)
         _training_triplets_path = None
 
         if flag_training_triplets_path:
             _training_triplets_path = training_triplets_path
             flag_training_triplets_path = False  # Only load triplets file for the first epoch
 
-        # Re-instantiate training dataloader to generate a triplet list for this training epoch
+        # Under DistributedDataParallel only rank 0 generates this epoch's triplet list: the
+        #  generator's worker processes write to shared temp file paths that concurrent ranks would
+        #  overwrite and delete from under each other. The other ranks wait at the barrier and load
+        #  the epoch file saved by rank 0 through the existing training_triplets_path mechanism.
+        if flag_train_multi_gpu and torch.distributed.get_rank() != 0:
+            if _training_triplets_path is None:
+                _training_triplets_path = \
+                    'datasets/generated_triplets/epoch_{}_training_triplets_{}_identities_{}_batch_{}.npy'.format(
+                        epoch, iterations_per_epoch * batch_size, num_human_identities_per_batch, batch_size
+                    )
+            torch.distributed.barrier()  # Wait for rank 0 to finish generating and saving the triplets
+
+        # Re-instantiate training dataset to generate a triplet list for this training epoch
+        train_dataset = TripletFaceDataset(
+            root_dir=dataroot,
+            csv_name=dataset_csv,
+            num_triplets=iterations_per_epoch * batch_size,
+            num_generate_triplets_processes=num_generate_triplets_processes,
+            num_human_identities_per_batch=num_human_identities_per_batch,
+            triplet_batch_size=batch_size,
+            epoch=epoch,
+            training_triplets_path=_training_triplets_path,
+            transform=data_transforms
+        )
+
+        if flag_train_multi_gpu and torch.distributed.get_rank() == 0:
+            torch.distributed.barrier()  # Release the waiting ranks now that the triplet file exists
+
+        # Shard the triplet list contiguously across ranks: DistributedSampler would interleave the
+        #  indices rank::world_size, which breaks the num_human_identities_per_batch grouping the
+        #  generator builds into each contiguous block of batch_size triplets. Whole-batch shards of
+        #  equal size also keep every rank's batch count identical.
+        if flag_train_multi_gpu:
+            num_batches_per_rank = len(train_dataset) // (batch_size * torch.distributed.get_world_size())
+            shard_start = torch.distributed.get_rank() * num_batches_per_rank * batch_size
+            train_dataset = torch.utils.data.Subset(
+                train_dataset, range(shard_start, shard_start + num_batches_per_rank * batch_size)
+            )
+
         train_dataloader = torch.utils.data.DataLoader(
-            dataset=TripletFaceDataset(
-                root_dir=dataroot,
-                csv_name=dataset_csv,
-                num_triplets=iterations_per_epoch * batch_size,
-                num_generate_triplets_processes=num_generate_triplets_processes,
-                num_human_identities_per_batch=num_human_identities_per_batch,
-                triplet_batch_size=batch_size,
-                epoch=epoch,
-                training_triplets_path=_training_triplets_path,
-                transform=data_transforms
-            ),
+            dataset=train_dataset,
             batch_size=batch_size,
             num_workers=num_workers,
+            prefetch_factor=4 if num_workers > 0 else None,  # Prefetching requires multiprocessing workers
+            pin_memory=True,  # Pinned (page-locked) host memory allows asynchronous host to device copies
+            drop_last=True,  # A partial final batch would not fit the preallocated device batch buffer
             shuffle=False  # Shuffling for triplets with set amount of human identities per batch is not required
         )
 
@@ -429,60 +561,79 @@ def main():
             pos_imgs = batch_sample['pos_img']
             neg_imgs = batch_sample['neg_img']
 
-            # Concatenate the input images into one tensor because doing multiple forward passes would create
-            #  weird GPU memory allocation behaviours later on during training which would cause GPU Out of Memory
-            #  issues
-            all_imgs = torch.cat((anc_imgs, pos_imgs, neg_imgs))  # Must be a tuple of Torch Tensors
+            # Copy the input images straight into the preallocated device buffer (one forward pass over
+            #  all three is kept because doing multiple forward passes would create weird GPU memory
+            #  allocation behaviours later on during training which would cause GPU Out of Memory
+            #  issues). This replaces the per-iteration host-side torch.cat allocation and upload.
+            all_imgs_buf[:batch_size].copy_(anc_imgs, non_blocking=True)
+            all_imgs_buf[batch_size: batch_size * 2].copy_(pos_imgs, non_blocking=True)
+            all_imgs_buf[batch_size * 2:].copy_(neg_imgs, non_blocking=True)
 
             anc_embeddings, pos_embeddings, neg_embeddings, model = forward_pass(
-                imgs=all_imgs,
+                imgs=all_imgs_buf,
                 model=model,
                 batch_size=batch_size
             )
 
-            pos_dists = l2_distance.forward(anc_embeddings, pos_embeddings)
-            neg_dists = l2_distance.forward(anc_embeddings, neg_embeddings)
+            # Squared L2 distances are enough for the triplet selection masks since the square root
+            #  operation preserves the distance ordering, keeping everything on the GPU avoids the
+            #  device-to-host round-trips of the previous numpy-based selection
+            pos_dists = (anc_embeddings - pos_embeddings).pow(2).sum(-1)
+            neg_dists = (anc_embeddings - neg_embeddings).pow(2).sum(-1)
+
+            # Hard Negative triplet selection
+            #  (negative_distance - positive_distance < margin)
+            #   Based on: https://github.com/davidsandberg/facenet/blob/master/src/train_tripletloss.py#L296
+            mask = (neg_dists - pos_dists < margin)
 
             if use_semihard_negatives:
-                # Semi-Hard Negative triplet selection
-                #  (negative_distance - positive_distance < margin) AND (positive_distance < negative_distance)
+                # Semi-Hard Negative triplet selection additionally requires
+                #  (positive_distance < negative_distance)
                 #   Based on: https://github.com/davidsandberg/facenet/blob/master/src/train_tripletloss.py#L295
-                first_condition = (neg_dists - pos_dists < margin).cpu().numpy().flatten()
-                second_condition = (pos_dists < neg_dists).cpu().numpy().flatten()
-                all = (np.logical_and(first_condition, second_condition))
-                valid_triplets = np.where(all == 1)
-            else:
-                # Hard Negative triplet selection
-                #  (negative_distance - positive_distance < margin)
-                #   Based on: https://github.com/davidsandberg/facenet/blob/master/src/train_tripletloss.py#L296
-                all = (neg_dists - pos_dists < margin).cpu().numpy().flatten()
-                valid_triplets = np.where(all == 1)
-
-            anc_valid_embeddings = anc_embeddings[valid_triplets]
-            pos_valid_embeddings = pos_embeddings[valid_triplets]
-            neg_valid_embeddings = neg_embeddings[valid_triplets]
-
-            del anc_embeddings, pos_embeddings, neg_embeddings, pos_dists, neg_dists
-            gc.collect()
-
-            # Calculate triplet loss
-            triplet_loss = TripletLoss(margin=margin).forward(
-                anchor=anc_valid_embeddings,
-                positive=pos_valid_embeddings,
-                negative=neg_valid_embeddings
+                mask &= (pos_dists < neg_dists)
+
+            valid_triplets = mask.nonzero(as_tuple=True)[0]
+
+            # Skip the loss and backward pass when no triplet in the batch met the selection method.
+            #  Under DistributedDataParallel every rank must still run a backward pass (and step, the
+            #  all-reduced gradients update the parameters on all ranks) so the NCCL bucket
+            #  reductions stay paired with the same iteration on every rank; a rank that skipped
+            #  would pair its next backward with the other ranks' current one and end in a hang.
+            if valid_triplets.numel() == 0:
+                if flag_train_multi_gpu:
+                    zero_loss = (anc_embeddings.sum() + pos_embeddings.sum() + neg_embeddings.sum()).float() * 0
+                    optimizer_model.zero_grad(set_to_none=True)
+                    scaler.scale(zero_loss).backward()
+                    scaler.step(optimizer_model)
+                    scaler.update()
+                    del zero_loss
+                del anc_embeddings, pos_embeddings, neg_embeddings, pos_dists, neg_dists, mask
+                continue
+
+            anc_valid_embeddings = anc_embeddings.index_select(0, valid_triplets)
+            pos_valid_embeddings = pos_embeddings.index_select(0, valid_triplets)
+            neg_valid_embeddings = neg_embeddings.index_select(0, valid_triplets)
+
+            del anc_embeddings, pos_embeddings, neg_embeddings, pos_dists, neg_dists, mask
+
+            # Calculate triplet loss (in float32 for a numerically stable reduction)
+            triplet_loss = triplet_loss_fn.forward(
+                anchor=anc_valid_embeddings.float(),
+                positive=pos_valid_embeddings.float(),
+                negative=neg_valid_embeddings.float()
             )
 
             # Calculating number of triplets that met the triplet selection method during the epoch
             num_valid_training_triplets += len(anc_valid_embeddings)
 
-            # Backward pass
-            optimizer_model.zero_grad()
-            triplet_loss.backward()
-            optimizer_model.step()
+            # Backward pass with gradient scaling to avoid float16 gradient underflow
+            optimizer_model.zero_grad(set_to_none=True)
+            scaler.scale(triplet_loss).backward()
+            scaler.step(optimizer_model)
+            scaler.update()
 
             # Clear some memory at end of training iteration
             del triplet_loss, anc_valid_embeddings, pos_valid_embeddings, neg_valid_embeddings
-            gc.collect()
 
         # Print training statistics for epoch and add to log
         print('Epoch {}:\tNumber of valid training triplets in epoch: {}'.format(
@@ -491,13 +642,19 @@ def main():
             )
         )
 
-        with open('logs/{}_log_triplet.txt'.format(model_architecture), 'a') as f:
-            val_list = [
-                epoch,
-                num_valid_training_triplets
-            ]
-            log = '\t'.join(str(value) for value in val_list)
-            f.writelines(log + '\n')
+        # The per-epoch log writes, the LFW validation (including its log and ROC/accuracy plot
+        #  writes) and the checkpoint save all run on rank 0 only when training with
+        #  DistributedDataParallel; the other ranks would duplicate the work and corrupt the
+        #  log files and plot images with concurrent writes
+        if flag_train_multi_gpu and torch.distributed.get_rank() != 0:
+            continue
+
+        val_list = [
+            epoch,
+            num_valid_training_triplets
+        ]
+        log = '\t'.join(str(value) for value in val_list)
+        train_log_file.write(log + '\n')
 
         # Evaluation pass on LFW dataset
         best_distances = validate_lfw(
@@ -505,17 +662,27 @@ def main():
             lfw_dataloader=lfw_dataloader,
             model_architecture=model_architecture,
             epoch=epoch,
-            epochs=epochs
+            epochs=epochs,
+            lfw_cache=lfw_cache,
+            lfw_log_file=lfw_log_file
         )
 
+        # The LFW batches are all cached after the first validation round; drop the dataloader so
+        #  its persistent workers and pinned prefetch buffers are torn down instead of idling for
+        #  the rest of the run
+        if lfw_dataloader is not None and lfw_cache:
+            lfw_dataloader = None
+
         # Save model checkpoint
         state = {
             'epoch': epoch,
             'embedding_dimension': embedding_dimension,
             'batch_size_training': batch_size,
-            'model_state_dict': model.state_dict(),
+            # Unwrap the torch.compile OptimizedModule so checkpoint keys match the plain model
+            'model_state_dict': model._orig_mod.state_dict(),
             'model_architecture': model_architecture,
             'optimizer_model_state_dict': optimizer_model.state_dict(),
+            'scaler_state_dict': scaler.state_dict(),
             'best_distance_threshold': np.mean(best_distances)
         }
 
@@ -523,12 +690,30 @@ def main():
         if flag_train_multi_gpu:
             state['model_state_dict'] = model.module.state_dict()
 
-        # Save model checkpoint
-        torch.save(state, 'model_training_checkpoints/model_{}_triplet_epoch_{}.pt'.format(
-                model_architecture,
-                epoch
+        # Clone the checkpoint to host memory first so the background write does not race with the
+        #  next epoch's parameter updates, then save it on a background thread so the write (hundreds
+        #  of MB for the larger backbones) does not block the next epoch's first training iterations
+        state = copy_state_to_cpu(state)
+
+        if checkpoint_thread is not None:
+            checkpoint_thread.join()  # Do not overlap disk writes of consecutive epoch checkpoints
+
+        checkpoint_thread = threading.Thread(
+            target=torch.save,
+            args=(state, 'model_training_checkpoints/model_{}_triplet_epoch_{}.pt'.format(
+                    model_architecture,
+                    epoch
+                )
             )
         )
+        checkpoint_thread.start()
+
+    # Make sure the last epoch's checkpoint is fully written before exiting
+    if checkpoint_thread is not None:
+        checkpoint_thread.join()
+
+    train_log_file.close()
+    lfw_log_file.close()
 
 
 if __name__ == '__main__':
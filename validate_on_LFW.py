@@ -81,19 +81,15 @@ def calculate_roc_values(thresholds, distances, labels, num_folds=10):
 
     for fold_index, (train_set, test_set) in enumerate(k_fold.split(indices)):
         # Find the best distance threshold for the k-fold cross validation using the train set
-        accuracies_trainset = np.zeros(num_thresholds)
-        for threshold_index, threshold in enumerate(thresholds):
-            _, _, _, _, accuracies_trainset[threshold_index] = calculate_metrics(
-                threshold=threshold, dist=distances[train_set], actual_issame=labels[train_set]
-            )
+        _, _, accuracies_trainset = calculate_metrics_vectorized(
+            thresholds=thresholds, dist=distances[train_set], actual_issame=labels[train_set]
+        )
         best_threshold_index = np.argmax(accuracies_trainset)
 
         # Test on test set using the best distance threshold
-        for threshold_index, threshold in enumerate(thresholds):
-            true_positive_rates[fold_index, threshold_index], false_positive_rates[fold_index, threshold_index], _, _,\
-                _ = calculate_metrics(
-                    threshold=threshold, dist=distances[test_set], actual_issame=labels[test_set]
-                )
+        true_positive_rates[fold_index], false_positive_rates[fold_index], _ = calculate_metrics_vectorized(
+            thresholds=thresholds, dist=distances[test_set], actual_issame=labels[test_set]
+        )
 
         _, _, precision[fold_index], recall[fold_index], accuracy[fold_index] = calculate_metrics(
             threshold=thresholds[best_threshold_index], dist=distances[test_set], actual_issame=labels[test_set]
@@ -106,6 +102,36 @@ def calculate_roc_values(thresholds, distances, labels, num_folds=10):
     return true_positive_rate, false_positive_rate, precision, recall, accuracy, best_distances
 
 
+def calculate_metrics_vectorized(thresholds, dist, actual_issame):
+    """Computes the true positive rate, false positive rate and accuracy for all thresholds at once
+    with a broadcast comparison instead of one Python-level pass over the distances per threshold."""
+    # If distance is less than threshold, then prediction is set to True
+    #  (num_thresholds x num_pairs boolean matrix)
+    predict_issame = np.less(dist[None, :], np.asarray(thresholds)[:, None])
+    actual_issame = np.asarray(actual_issame, dtype=bool)
+
+    true_positives = np.sum(np.logical_and(predict_issame, actual_issame), axis=1)
+    false_positives = np.sum(np.logical_and(predict_issame, np.logical_not(actual_issame)), axis=1)
+
+    num_same = np.sum(actual_issame)
+    num_diff = np.sum(np.logical_not(actual_issame))
+    true_negatives = num_diff - false_positives
+    false_negatives = num_same - true_positives
+
+    # For dealing with Divide By Zero exception
+    true_positive_rate = np.where(
+        true_positives + false_negatives == 0, 0.0,
+        true_positives / np.maximum(true_positives + false_negatives, 1)
+    )
+    false_positive_rate = np.where(
+        false_positives + true_negatives == 0, 0.0,
+        false_positives / np.maximum(false_positives + true_negatives, 1)
+    )
+    accuracy = (true_positives + true_negatives) / dist.size
+
+    return true_positive_rate, false_positive_rate, accuracy
+
+
 def calculate_metrics(threshold, dist, actual_issame):
     # If distance is less than threshold, then prediction is set to True
     predict_issame = np.less(dist, threshold)
@@ -135,7 +161,6 @@ def calculate_metrics(threshold, dist, actual_issame):
 
 def calculate_val(thresholds_val, distances, labels, far_target=1e-3, num_folds=10):
     num_pairs = min(len(labels), len(distances))
-    num_thresholds = len(thresholds_val)
     k_fold = KFold(n_splits=num_folds, shuffle=False)
 
     tar = np.zeros(num_folds)
@@ -145,11 +170,9 @@ def calculate_val(thresholds_val, distances, labels, far_target=1e-3, num_folds=
 
     for fold_index, (train_set, test_set) in enumerate(k_fold.split(indices)):
         # Find the euclidean distance threshold that gives false acceptance rate (far) = far_target
-        far_train = np.zeros(num_thresholds)
-        for threshold_index, threshold in enumerate(thresholds_val):
-            _, far_train[threshold_index] = calculate_val_far(
-                threshold=threshold, dist=distances[train_set], actual_issame=labels[train_set]
-            )
+        far_train = calculate_far_vectorized(
+            thresholds=thresholds_val, dist=distances[train_set], actual_issame=labels[train_set]
+        )
         if np.max(far_train) >= far_target:
             f = interpolate.interp1d(far_train, thresholds_val, kind='slinear')
             threshold = f(far_target)
@@ -163,6 +186,23 @@ def calculate_val(thresholds_val, distances, labels, far_target=1e-3, num_folds=
     return tar, far
 
 
+def calculate_far_vectorized(thresholds, dist, actual_issame):
+    """Computes the false acceptance rate for all thresholds at once with a broadcast comparison
+    instead of one Python-level pass over the distances per threshold."""
+    # If distance is less than threshold, then prediction is set to True
+    #  (num_thresholds x num_pairs boolean matrix)
+    predict_issame = np.less(dist[None, :], np.asarray(thresholds)[:, None])
+    actual_issame = np.asarray(actual_issame, dtype=bool)
+
+    false_accept = np.sum(np.logical_and(predict_issame, np.logical_not(actual_issame)), axis=1)
+
+    num_diff = np.sum(np.logical_not(actual_issame))
+    if num_diff == 0:
+        num_diff = 1
+
+    return false_accept / float(num_diff)
+
+
 def calculate_val_far(threshold, dist, actual_issame):
     # If distance is less than threshold, then prediction is set to True
     predict_issame = np.less(dist, threshold)